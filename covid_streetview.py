@@ -53,14 +53,57 @@ which the images update will be relative to the current national caseload.
 """
 
 import requests 
+from requests.adapters import HTTPAdapter
 import pandas
-import io
+import numpy
 from datetime import date
 import time
-import urllib
+import shutil
 from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
+from concurrent.futures import ThreadPoolExecutor
 import os
 import csv
+import json
+import tempfile
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# One keep-alive session shared by every HTTP request, so each host only
+# pays for its TCP and TLS handshakes once.
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Local directory for data kept between runs (NYT data and geocoded counties).
+CACHE_FOLDER = os.path.join(os.path.expanduser('~'), '.cache', 'covid_streetview')
+
+
+def groupDiff(groups, values):
+    """ Calculates the day to day difference of values within each group.
+
+    Expects both arrays to already be sorted by group and then by date. The
+    first row of each group has no previous day, so it is set to NaN.
+
+    Parameters:
+        groups : ndarray
+            integer code of the group each row belongs to
+        values : ndarray
+            cumulative numbers to take the difference of
+
+    Returns:
+        diff : ndarray
+            float array the same length as values
+
+    """
+    diff = numpy.empty(len(values), dtype='float64')
+    if len(values) == 0:
+        return diff
+    diff[0] = numpy.nan
+    diff[1:] = numpy.diff(values.astype('float64'))
+    diff[1:][groups[1:] != groups[:-1]] = numpy.nan
+    return diff
 
 
 class NYTCovidData:
@@ -81,16 +124,28 @@ class NYTCovidData:
         stores top case numbers in list
     countydf : DataFrame
         pandas DataFrame to store data from NYT CSV file
+    countyColumns : list
+        columns read from the NYT CSV file (fips is skipped, it is never used)
+    countyDtypes : dict
+        column dtypes used when reading the NYT CSV file
+    topDF : DataFrame
+        rows of the most recent date with the most cases, limited to numCounties
     _countyupdated : bool
         checks updateCounty()
     _processed : bool
         checks process()
     _sorted : bool
         checks sortByCases()
-    countydict : dictionary
-        stores data from countydf[DataFrame]
     countylist : list 
         list of every unique county in NYT CSV file
+    cacheFolder : str
+        local directory for the cached copy of the NYT data
+    cacheData : str
+        path to the parquet copy of the last downloaded countydf[DataFrame]
+    cacheTag : str
+        path to the ETag and Last-Modified headers of the last download
+    cacheMaxAge : int
+        seconds a cached copy is used without revalidating (None always asks)
 
     Methods
     -------
@@ -98,12 +153,18 @@ class NYTCovidData:
         Prints today's date.
     updateCounty():
         Retrieves CSV data from NYT repo and stores it in countydf[DataFrame].
+    readCounty(response):
+        Reads the streamed CSV into countydf[DataFrame] and caches it.
+    loadCache():
+        Loads countydf[DataFrame] from cacheData, deleting it if unreadable.
+    saveCache(headers):
+        Saves countydf[DataFrame] and the response headers to cacheFolder.
     dateUpdate():
         Checks that updateCounty() has been run and prints date of newest data.
     process():
-        Processes countydf[DataFrame] using countydict{} and countylist[].
+        Adds new cases and new deaths per county to countydf[DataFrame].
     sortByCases():
-        Sorts countydf[DataFrame] by date then cases.    
+        Selects the most recent rows with the most cases into topDF[DataFrame].    
     getTopCounties():
         Stores top counties in topCounties[].  
         
@@ -120,30 +181,146 @@ class NYTCovidData:
         self._countyupdated = False
         self._processed = False
         self._sorted = False
+        self.topDF = None
+        self.countyColumns = ['date', 'county', 'state', 'cases', 'deaths']
+        self.countyDtypes = {'cases':'int32', 'deaths':'float32', 'county':'category',
+                             'state':'category'}
+        self.cacheFolder = CACHE_FOLDER
+        self.cacheData = os.path.join(self.cacheFolder, 'us-counties.parquet')
+        self.cacheTag = os.path.join(self.cacheFolder, 'etag.txt')
+        self.cacheMaxAge = None
     
     def today(self):
         """Prints today's date from datetime library."""
-        print("Today's date is: ",self._today)
+        logger.info("Today's date is:  %s", self._today)
               
     def updateCounty(self):
         """ Retrieves most recent data from New York Times Covid19 repository.
         
-        Uses requests library to get the CSV file at URL NYTcountiesData. 
-        Uses pandas library to read the CSV and save in countydf[DataFrame].
-        Formats the date axis of countydf. Sets _countyupdated = True. 
+        Uses the shared requests SESSION to stream the CSV file at URL 
+        NYTcountiesData and reads it with readCounty(). Sets 
+        _countyupdated = True. 
+        
+        If cacheMaxAge is set and cacheData was saved or revalidated less 
+        than cacheMaxAge seconds ago, countydf[DataFrame] is loaded from it 
+        without contacting the server. Otherwise if a cached copy exists, 
+        the request is sent with the ETag and Last-Modified headers 
+        saved by saveCache(). When the server answers 304 Not Modified, 
+        countydf[DataFrame] is loaded from cacheData instead of downloading 
+        the CSV again. If the cached copy cannot be read, the CSV is 
+        downloaded again without the cache headers.
        
         Uses:
             countydf : DataFrame
                 contains the data from NYT counties CSV file
+            cacheData : str
+            cacheTag : str
             _countyupdated : bool
             
         """
         url = self.NYTcountiesData
-        s = requests.get(url).content
-        self.countydf = pandas.read_csv(io.StringIO(s.decode('utf-8')))
-        self.countydf['date'] =  pandas.to_datetime(self.countydf['date'], format='%Y-%m-%d')
+        if self.cacheMaxAge is not None and os.path.exists(self.cacheData) \
+                and time.time() - os.path.getmtime(self.cacheData) < self.cacheMaxAge:
+            if self.loadCache():
+                self._countyupdated = True
+                return
+        
+        headers = {}
+        if os.path.exists(self.cacheData) and os.path.exists(self.cacheTag):
+            with open(self.cacheTag, 'r') as tagDoc:
+                etag, modified = (tagDoc.read().split('\n') + ['', ''])[:2]
+            if etag:
+                headers['If-None-Match'] = etag
+            if modified:
+                headers['If-Modified-Since'] = modified
+        
+        with SESSION.get(url, stream=True, headers=headers) as response:
+            if response.status_code != 304:
+                self.readCounty(response)
+            elif self.loadCache():
+                os.utime(self.cacheData)
+            else:
+                with SESSION.get(url, stream=True) as retry:
+                    self.readCounty(retry)
         self._countyupdated = True
     
+    def readCounty(self, response):
+        """ Reads the NYT counties CSV from a streamed response.
+        
+        Uses pandas library to read the CSV straight from the response and
+        save in countydf[DataFrame], parsing the date axis as it reads. Only
+        countyColumns are read, with compact dtypes: 32-bit case and death 
+        counts (deaths can be blank, so it is a float) and categorical county
+        and state names. Saves the result with saveCache().
+
+        Parameters:
+            response : Response
+                streamed response for URL NYTcountiesData
+            
+        """
+        response.raise_for_status()
+        response.raw.decode_content = True
+        self.countydf = pandas.read_csv(response.raw, usecols=self.countyColumns, parse_dates=['date'],
+                                        dtype=self.countyDtypes)
+        self.saveCache(response.headers)
+    
+    def loadCache(self):
+        """ Loads countydf[DataFrame] from cacheData.
+        
+        If the file cannot be read (e.g. a truncated write), both cacheData
+        and cacheTag are deleted so the next request is unconditional. Logs
+        the date of the newest data that was loaded.
+
+        Returns:
+            loaded : bool
+                True if countydf[DataFrame] was loaded from cacheData
+            
+        """
+        try:
+            self.countydf = pandas.read_parquet(self.cacheData, engine='pyarrow')
+            logger.info('Loaded NYT data through %s from cache.', self.countydf['date'].max().date())
+            return True
+        except Exception:
+            logger.warning('Could not read cached NYT data, downloading it again.')
+            for cacheFile in (self.cacheData, self.cacheTag):
+                if os.path.exists(cacheFile):
+                    os.remove(cacheFile)
+            return False
+    
+    def saveCache(self, headers):
+        """ Saves a local copy of the NYT data to skip unchanged downloads.
+        
+        Writes countydf[DataFrame] as zstd compressed parquet using the 
+        pyarrow engine, which also reads it back with multiple threads. The
+        file is written to a temporary file in cacheFolder and then moved 
+        over cacheData, so a failed write never leaves a partial cache. Only
+        then are the ETag and Last-Modified response headers written to 
+        cacheTag. If the cache cannot be written (e.g. pyarrow is not 
+        installed) it prints a message and the script carries on without it.
+
+        Parameters:
+            headers : dict
+                headers of the response the CSV was read from
+            
+        """
+        tempData = None
+        try:
+            os.makedirs(self.cacheFolder, exist_ok=True)
+            tempFd, tempData = tempfile.mkstemp(suffix='.parquet', dir=self.cacheFolder)
+            os.close(tempFd)
+            self.countydf.to_parquet(tempData, engine='pyarrow', compression='zstd')
+            if os.path.exists(self.cacheTag):
+                os.remove(self.cacheTag)
+            os.replace(tempData, self.cacheData)
+            tempData = None
+            with open(self.cacheTag, 'w') as tagDoc:
+                tagDoc.write(headers.get('ETag', '') + '\n' + headers.get('Last-Modified', ''))
+        except Exception:
+            logger.warning('Could not cache NYT data.')
+        finally:
+            if tempData is not None and os.path.exists(tempData):
+                os.remove(tempData)
+    
     def dateUpdate(self):
         """ Checks for most recent data.
         
@@ -152,73 +329,77 @@ class NYTCovidData:
             
         """
         if self._countyupdated:
-            print("Most recent data:",self.countydf.iloc[-1]['date'].date())
+            logger.info("Most recent data: %s", self.countydf.iloc[-1]['date'].date())
         else:
-            print("Data has not been updated!")
+            logger.warning("Data has not been updated!")
                
     def process(self):
         """Processes NYT data.
         
-        Usually takes 60-120 seconds to run. 
-
-        Creates a dictionary to store data from countydf[DataFrame]. Creates a
-        list of all counties, and uses it to traverse countydf[DataFrame]. 
-        Calculates new cases and new deaths in each county and stores in 
-        countydict{}. Prints time it took to process once complete. 
+        Creates a list of all counties. Sorts countydf[DataFrame] by county
+        and date, then calculates new cases and new deaths in each county with
+        groupDiff() and stores them in countydf[DataFrame]. The NYT file is
+        already in date order, so a stable sort on county alone is enough,
+        and with fewer than 32768 counties the codes fit in int16, which 
+        numpy sorts with a radix sort. Both keys are only sorted if the dates
+        are out of order. Prints time it took to process once complete. 
         
         Uses:
-            countydict : dictionary
-                contains data from countydf[DataFrame]
             countylist : list 
                 all unique counties 
             _processed : bool
             
         """
-        pandas.set_option('mode.chained_assignment', None)
-        self.countydict= {}
         t1 = time.time()
         
         if self._countyupdated:
-            self.countylist = list(self.countydf['county'].unique())
-            print('')
-            print(f'Processing {str(len(self.countylist))} counties...')
+            codes, uniques = pandas.factorize(self.countydf['county'])
+            self.countylist = list(uniques)
+            logger.info('\nProcessing %d counties...', len(self.countylist))
             
-            for c in self.countylist:
-                county_df=self.countydf[self.countydf['county']==c]
-                county_df['newcases'] = county_df['cases'].diff()
-                county_df['newdeaths'] = county_df['deaths'].diff()
-                self.countydict[c]=county_df       
+            if self.countydf['date'].is_monotonic_increasing:
+                sortCodes = codes.astype('int16') if len(uniques) < 2**15 else codes
+                order = numpy.argsort(sortCodes, kind='stable')
+            else:
+                order = numpy.lexsort((self.countydf['date'].to_numpy(), codes))
+            codes = codes[order]
+            sorteddf = self.countydf.iloc[order]
+            self.countydf = sorteddf.assign(newcases=groupDiff(codes, sorteddf['cases'].to_numpy()),
+                                            newdeaths=groupDiff(codes, sorteddf['deaths'].to_numpy()))
         
         self._processed = True
         t2 = time.time()
         delt = round(t2-t1,3)
-        print("Finished. Took {} seconds".format(delt))
+        logger.info('Finished. Took %s seconds', delt)
                     
     def sortByCases(self):
-        """ Sorts counties by date and total cases
+        """ Selects counties with the most total cases on the most recent date
         
-        Checks that process() has been run. Sorts countydf[DataFrame] by most 
-        recent, then total cases in descending order. Prints to terminal.
+        Checks that process() has been run. Filters countydf[DataFrame] to the
+        most recent date and keeps the numCounties rows with the most total 
+        cases, in descending order, with nlargest() instead of sorting every
+        row. Prints to terminal.
         
         Returns:
-            countydf : DataFrame
+            topDF : DataFrame
             _sorted : bool
         
         """
         if self._processed:
-            self.countydf = self.countydf.sort_values(by=['date','cases'], ascending=False)
+            latest = self.countydf['date'].max()
+            todaydf = self.countydf[self.countydf['date'] == latest]
+            self.topDF = todaydf.nlargest(self.numCounties, 'cases')
             self._sorted = True
-            print('Sorted by recent number of cases per county.')
-            print('')
+            logger.info('Sorted by recent number of cases per county.')
         else:
-            print('Not processed yet!')
+            logger.warning('Not processed yet!')
                             
     def getTopCounties(self):
         """ Creates list of counties with most cases today.
 
-        Checks that countydf[DataFrame] has been sorted. Extracts the county 
-        and state from the DataFrame and formats each into a single string 
-        as 'county,state'. Saves each location string to topCounties[].
+        Checks that topDF[DataFrame] has been selected. Extracts the county 
+        and state columns from the DataFrame and joins them into a single 
+        string as 'county,state'. Saves the location strings to topCounties[].
         Prints the number of counties, sorting method, and each county name.
 
         Uses:
@@ -226,15 +407,11 @@ class NYTCovidData:
             
         """
         if self._sorted:       
-            for c in range(self.numCounties):
-                county_ = self.countydf.iloc[c]['county']
-                state_ = self.countydf.iloc[c]['state']
-                location_ = str(f'{county_},{state_}')
-                self.topCounties.append(location_)
+            top = self.topDF.head(self.numCounties)
+            self.topCounties = (top['county'].astype(str) + ',' + top['state'].astype(str)).tolist()
             
-            print(f'Top {covid.numCounties} counties by total cases:')
-            for location in covid.topCounties:
-                print(f'   {location}')
+            logger.info('\nTop %d counties by total cases:\n%s', covid.numCounties,
+                        '\n'.join('   ' + location for location in covid.topCounties))
                 
     def getTopCases(self):
         """ Creates list of only the case numbers per county.
@@ -244,9 +421,7 @@ class NYTCovidData:
             
         """
         if self._sorted:       
-            for c in range(self.numCounties):
-                cases_ = self.countydf.iloc[c]['cases']
-                self.topCases.append(cases_)
+            self.topCases = self.topDF['cases'].head(self.numCounties).tolist()
 
 
 class StreetView:
@@ -272,16 +447,35 @@ class StreetView:
         number of images processed 
     numLocations : int
         number of locations processed 
+    geocodeWorkers : int
+        number of background threads sending geocoding requests (Nominatim 
+        asks bulk clients to use one)
+    downloadWorkers : int
+        number of threads used to download images
+    baseUrl : str
+        URL of the streetview static API
+    urlSuffix : str
+        URL parameters shared by every image: size, fov, radius and apiKey
+    geoCachePath : str
+        path to the JSON file of previously geocoded counties
+    geoCache : dict
+        stores (latitude, longitude) of each 'County,State' already geocoded
 
     Methods
     -------
     getKey():
         Pulls API key from keys.txt.
-    getStreetView(lat_, lon_, heading_, fileName_, saveFolder_):
-        Compiles URL and downloads image from streetview API.
+    loadGeoCache():
+        Reads geoCache{} from geoCachePath.
+    saveGeoCache():
+        Writes geoCache{} to geoCachePath.
+    getStreetView(locationUrl_, heading_, fileName_, saveFolder_):
+        Completes URL and downloads image from streetview API.
+    geocodeCounties():
+        Yields each (lat, lon) from topCounties['County,State'] as soon as it is known.
     makeLatLon():
         Generates locations['float(lat),float(lon)'] from topCounties['County,State'].
-    execute():
+    execute(locations_):
         Generates filename and calls getStreetView(parameters).
     """    
     
@@ -296,6 +490,13 @@ class StreetView:
         self.filename = ''
         self.numImages = 0
         self.numLocations = 1
+        self.geocodeWorkers = 1
+        self.downloadWorkers = 8
+        self.baseUrl = r'https://maps.googleapis.com/maps/api/streetview?'
+        self.urlSuffix = ''
+        self.geoCachePath = os.path.join(CACHE_FOLDER, 'geo.json')
+        self.geoCache = {}
+        self.loadGeoCache()
         # self.localFolder = '/Users/ethanfrier/Desktop/covid19_streetview/downloadImages/'
 
     def getKey(self):
@@ -304,80 +505,163 @@ class StreetView:
         API keys should be kept secret. This method gets a key string from 
         keys.txt file which only contains the API key string. This text 
         file is included in the gitignore file so it stays private. Prints
-        obfuscated API key to terminal.
+        obfuscated API key to terminal. Builds urlSuffix from the key and 
+        the other parameters that are the same for every image.
 
         Uses:
             apiKey : str 
+            urlSuffix : str
             
         """
         keyDoc = open('keys.txt', 'r')
         self.apiKey = keyDoc.read()
+        self.urlSuffix = f'&size={self.size}&fov={self.fov}&radius={self.radius}&key={self.apiKey.strip()}'
         printKeyA, printKeyB = self.apiKey[0:5],self.apiKey[-6:-1]
-        print(f'Recieved API key: {printKeyA}xxxxxxxxxxxxxxxxxx{printKeyB}')
-        print('')
+        logger.info('Recieved API key: %sxxxxxxxxxxxxxxxxxx%s', printKeyA, printKeyB)
+
+    def loadGeoCache(self):
+        """ Reads previously geocoded counties from geoCachePath.
+
+        County coordinates rarely change and the top counties overlap from
+        day to day, so makeLatLon() only geocodes counties missing from 
+        geoCache{}. If the file does not exist or cannot be read, geoCache{}
+        stays empty.
 
-    def getStreetView(self, lat_, lon_, heading_, fileName_, saveFolder_):
-        """ Compiles unique URL and downloads images from streetview API.
+        Uses:
+            geoCache : dict
+            geoCachePath : str
+            
+        """
+        try:
+            with open(self.geoCachePath, 'r') as geoDoc:
+                self.geoCache = {L: tuple(latLon) for L, latLon in json.load(geoDoc).items()}
+        except Exception:
+            self.geoCache = {}
+
+    def saveGeoCache(self):
+        """ Writes geoCache{} to geoCachePath as JSON.
+
+        Prints a message and carries on if the file cannot be written.
+
+        Uses:
+            geoCache : dict
+            geoCachePath : str
+            
+        """
+        try:
+            os.makedirs(os.path.dirname(self.geoCachePath), exist_ok=True)
+            with open(self.geoCachePath, 'w') as geoDoc:
+                json.dump(self.geoCache, geoDoc)
+        except Exception:
+            logger.warning('Could not cache geocoded locations.')
+
+    def getStreetView(self, locationUrl_, heading_, fileName_, saveFolder_):
+        """ Completes unique URL and downloads images from streetview API.
         
-        Generates unique URL using: size, lat_, lon_, fov, heading_, radius, apiKey.
-        Uses urllib library to send request to API. Downloads images to 
-        designated folder and saves as .jpg using filename_ 
+        Generates unique URL by adding heading_ to locationUrl_, which 
+        already holds baseUrl, the location and urlSuffix.
+        Uses the shared requests SESSION to send request to API. Streams 
+        images to designated folder in 64 KB chunks and saves as .jpg using 
+        filename_ 
 
         Parameters:
-            lat_ : float
-            lon_ : float
+            locationUrl_ : str
             heading_ : int
             fileName_ : str
             saveFolder : str
             
         Uses:
-            urllib request
-                urllib.request.urlretrieve()
+            SESSION : Session
+                SESSION.get(stream=True)
             streetview image download to localFolder
+            
+        Returns:
+            fileName_ : str
                 
         """
-        base = r'https://maps.googleapis.com/maps/api/streetview?'
-        imageSize = r'&size={}'.format(self.size) 
-        imageLocation = r'&location={0},{1}'.format(lat_, lon_)
-        imageHeading = r'&fov={0}&heading={1}'.format(self.fov, heading_)
-        searchRadius = r'&radius={}'.format(self.radius)
-        useKey = r'&key={}'.format(self.apiKey)
-       
-        myUrl = base + imageSize + imageLocation + imageHeading + searchRadius + useKey 
-        urllib.request.urlretrieve(myUrl, os.path.join(saveFolder_,fileName_))
+        myUrl = locationUrl_ + '&heading=' + str(heading_)
+        with SESSION.get(myUrl, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(os.path.join(saveFolder_,fileName_), 'wb') as image:
+                shutil.copyfileobj(response.raw, image, 64 * 1024)
+        return fileName_
    
-    def makeLatLon(self):
-        """ Generates list of locations as latitude and longitude.
+    def geocodeCounties(self):
+        """ Yields each top county as latitude and longitude as soon as known.
 
         This method uses the geopy library to convert a text string location 
-        into a latitude and longitude. It uses topCounties[] as an input. It
+        into a latitude and longitude. It uses topCounties[] as an input. 
+        Counties already in geoCache{} are not requested again. The other
+        requests are sent from a background pool of geocodeWorkers threads,
+        and RateLimiter keeps them at least one second apart as required by
+        Nominatim, so the rate limit (not network latency) sets the pace. 
+        Locations are yielded in rank order and appended to locations[] as 
+        each one is ready, so execute() can start downloading before the 
+        rest are geocoded. New results are 
+        added to geoCache{} and saved with saveGeoCache(), even if a later 
+        county fails to geocode. Prints each location as it is yielded. It 
         also generates an address for each location which is stored in 
         locationText (unused).
 
         Uses:
             locations[] : list 
                 formated as ['float(latitude),float(longitude)']
+            geoCache : dict
             locationText : str
+
+        Yields:
+            latLon : tuple
+                (float(latitude), float(longitude)) of each county in topCounties[]
             
         """
         geolocator = Nominatim(user_agent="covid_streetview")
-        print('')
-        print(f'Using geopy, converting {len(covid.topCounties)} locations:')
+        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+        logger.info('\nUsing geopy, converting %d locations:', len(covid.topCounties))
         
-        for L in covid.topCounties:
-            convertLocation = geolocator.geocode(L) 
-            # locationText = convertLocation.address 
-            latLon = (convertLocation.latitude,convertLocation.longitude)
+        newCounties = [L for L in dict.fromkeys(covid.topCounties) if L not in self.geoCache]
+        try:
+            with ThreadPoolExecutor(max_workers=self.geocodeWorkers) as pool:
+                futures = {L: pool.submit(geocode, L) for L in newCounties}
+                
+                for L in covid.topCounties:
+                    if L not in self.geoCache:
+                        convertLocation = futures[L].result()
+                        # locationText = convertLocation.address 
+                        self.geoCache[L] = (convertLocation.latitude,convertLocation.longitude)
+                    latLon = self.geoCache[L]
+                    
+                    self.locations.append(latLon)
+                    logger.info('   %s', latLon)
+                    yield latLon
+        finally:
+            if newCounties:
+                self.saveGeoCache()
+
+    def makeLatLon(self):
+        """ Generates list of locations as latitude and longitude.
+
+        Runs geocodeCounties() to completion, which prints every location.
+
+        Uses:
+            locations[] : list 
+                formated as ['float(latitude),float(longitude)']
             
-            self.locations.append(latLon)
-            print(f'   {latLon}')
+        """
+        for latLon in self.geocodeCounties():
+            pass
 
-    def execute(self):
+    def execute(self, locations_=None):
         """ Formats filename and parameters for streetview API request
 
-        Loops through each location in locations[] and generates a unique 
-        filename and parameters for getStreetView(). It then calls 
-        getStreetView() and prints each time an image has been downloaded. 
+        Loops through each location in locations_ (locations[] by default)
+        and builds its URL once from baseUrl, lat, lon and urlSuffix. Then 
+        generates a unique filename and parameters for getStreetView() for 
+        each heading and submits it to a pool of downloadWorkers threads 
+        right away. Passing geocodeCounties() as locations_ overlaps the 
+        downloads of each county with the geocoding of the next ones. Once 
+        every location has been submitted, prints each time an image has 
+        been downloaded. 
         
         The variables and structurs for generating each image: 
             location[i] (i = 'float(lat),float(lon)')
@@ -386,14 +670,20 @@ class StreetView:
                     lon (extracted from locations[i])
                     numLocations (ranking of county and order it is processed)
         
+        Parameters:
+            locations_ : iterable
+                (lat, lon) of each county in rank order, defaults to locations[]
+
         Calls Method:
-            getStreetView(float(lat), float(lon), int(headings[i]), str(filename), str(self.localFolder).    
+            getStreetView(str(locationUrl), int(headings[i]), str(filename), str(self.localFolder).    
             
         Uses:
             lat : float 
                 extracted from locations[i]
             lon : float 
                 extracted from locations[i]
+            locationUrl : str
+                baseUrl + location + urlSuffix
             filename : str 
                 ending in .jpg using: numLocations, headings[i], lat, lon
             numImages : int
@@ -402,22 +692,26 @@ class StreetView:
                 number of locations processed
                 
         """  
-        print('')
-        print('Downloading from Streetview static API:')
+        if locations_ is None:
+            locations_ = self.locations
         
-        for location in self.locations:
-            for heading in self.headings:
-                
+        with ThreadPoolExecutor(max_workers=self.downloadWorkers) as pool:
+            downloads = []
+            for location in locations_:
                 lat, lon = location    
                 NYTlocation =  covid.topCounties[((self.numLocations)-1)].replace(" ","")
+                locationUrl = f'{self.baseUrl}&location={lat},{lon}{self.urlSuffix}'
                 
-                self.filename = "{0}_{1}_{2}_({3},{4},h{5}).jpg".format(str(self.numLocations).zfill(3), covid._today, NYTlocation, lat, lon, heading)        
-                self.getStreetView(lat, lon, heading, self.filename, go.todayPath)  
+                for heading in self.headings:
+                    self.filename = "{0}_{1}_{2}_({3},{4},h{5}).jpg".format(str(self.numLocations).zfill(3), covid._today, NYTlocation, lat, lon, heading)        
+                    downloads.append(pool.submit(self.getStreetView, locationUrl, heading, self.filename, go.todayPath))
                 
-                print(f'   Got {self.filename}')      
-                self.numImages += 1      
+                self.numLocations += 1
             
-            self.numLocations += 1
+            logger.info('\nDownloading from Streetview static API:')
+            for download in downloads:
+                logger.info('   Got %s', download.result())      
+                self.numImages += 1      
                
 
 class DailyDataManager:
@@ -474,12 +768,10 @@ class DailyDataManager:
         self.todayPath = os.path.join(self.saveFolder, self.nameFolder)
         try:
             os.mkdir(self.todayPath)
-            print('')
-            print(f'New folder /dailyData/{self.nameFolder} created')
+            logger.info('\nNew folder /dailyData/%s created', self.nameFolder)
         except Exception:
             pass
-            print('')
-            print(f'Folder /dailyData/{self.nameFolder} already exists!')
+            logger.info('\nFolder /dailyData/%s already exists!', self.nameFolder)
 
     def createCSV(self):
         """ Creates a CSV file of data used to get streetview images.
@@ -502,17 +794,16 @@ class DailyDataManager:
                 list of strings of top counties formated as 'latitude,longitude'
             
         """
-        os.chdir(self.todayPath)
-        with open(self.nameCSV,'w', newline='') as newCSV:
+        with open(os.path.join(self.todayPath, self.nameCSV),'w', newline='') as newCSV:
             CSVwriter = csv.writer(newCSV)  
+            rows = [(idx+1, covid.topCases[idx], data, geo.locations[idx]) for idx, data in enumerate(covid.topCounties)]
             CSVwriter.writerow(['rank', 'cases', 'county', 'latLon'])
-            for idx, data in enumerate(covid.topCounties):
-                CSVwriter.writerow( [idx+1, covid.topCases[idx], data, geo.locations[idx]])
-            print(f'Saved {self.nameCSV} to /{self.nameFolder}')
-        os.chdir(self.rootFolder)
+            CSVwriter.writerows(rows)
+            logger.info('Saved %s to /%s', self.nameCSV, self.nameFolder)
             
             
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     covid = NYTCovidData()
     geo = StreetView()
     go = DailyDataManager()
@@ -526,16 +817,13 @@ if __name__ == "__main__":
     covid.sortByCases()
     covid.getTopCounties()
     covid.getTopCases()
-    geo.makeLatLon()      
     
     go.createFolder()
+    geo.execute(geo.geocodeCounties())
     go.createCSV()
     
-    geo.execute()
-    
-    print('')
-    print(f'Processed {str(geo.numImages)} images.')
-    print('Done.')
+    logger.info('\nProcessed %d images.', geo.numImages)
+    logger.info('Done.')
 
 
 